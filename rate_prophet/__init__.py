@@ -1 +1,10 @@
-from rate_prophet.rate_prophet_controller import RateProphetController
+from rate_prophet.config_utils import AppPage
+
+
+def __getattr__(name):
+    # The controller pulls in streamlit, import it only when the UI asks for it
+    if name == "RateProphetController":
+        from rate_prophet.rate_prophet_controller import RateProphetController
+
+        return RateProphetController
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,265 @@
+"""
+ App command line interface (headless, no streamlit)
+
+ python run_cli.py [--db config.db] [--profile] <command> ...
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from rate_prophet.http_service import serve
+from rate_prophet.model_db import SQLiteModel
+from rate_prophet.rate_prophet_logic import RateProphetLogic
+
+
+class StageProfiler:
+    """
+    Collects wall clock time and processed rows per named stage.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.stages: list[dict] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Times the enclosed block. Yields the stage record, processed rows are
+        counted by updating record["rows"].
+        """
+        record = {"name": name, "rows": 0, "seconds": 0.0}
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = time.perf_counter() - start
+            self.stages.append(record)
+
+    def report(self, stream=sys.stderr):
+        """
+        Prints per stage timings and throughput if profiling is enabled.
+        """
+        if not self.enabled:
+            return
+        print(f"{'stage':<32}{'seconds':>10}{'rows':>12}{'rows/s':>14}", file=stream)
+        for record in self.stages:
+            name, rows, seconds = record["name"], record["rows"], record["seconds"]
+            throughput = f"{rows / seconds:,.0f}" if rows and seconds > 0 else "-"
+            print(f"{name:<32}{seconds:>10.3f}{rows:>12}{throughput:>14}", file=stream)
+
+
+def read_pair_csv(path: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Reads a CSV file with timestamp and value columns (see assets/test_pair.csv).
+
+    Returns:
+    - A tuple (timestamps as datetime64[s], values as float64) of numpy arrays.
+    """
+    frame = pd.read_csv(path, usecols=["timestamp", "value"])
+    timestamps = pd.to_datetime(frame["timestamp"], format="ISO8601")
+    return (
+        timestamps.values.astype("datetime64[s]"),
+        frame["value"].to_numpy(dtype=np.float64),
+    )
+
+
+def _split_source(source: str) -> tuple[str, str]:
+    """
+    Splits an import source "NAME=PATH" into (name, path), PATH alone uses the file name.
+    """
+    if "=" in source:
+        name, path = source.split("=", 1)
+        return name, path
+    return os.path.splitext(os.path.basename(source))[0], source
+
+
+def command_import(logic: RateProphetLogic, args, profiler: StageProfiler) -> int:
+    """
+    Imports many CSV files, parsed in parallel processes and inserted one by one
+    (SQLite allows a single writer).
+    """
+    sources = [_split_source(source) for source in args.sources]
+    failed = 0
+    parsed = []
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        with profiler.stage("parse csv (parallel)") as parse_stage:
+            futures = [executor.submit(read_pair_csv, path) for _, path in sources]
+            for (name, path), future in zip(sources, futures):
+                try:
+                    timestamps, values = future.result()
+                except (OSError, ValueError) as e:
+                    print(f"{name}: cannot read {path}: {e}", file=sys.stderr)
+                    failed += 1
+                    continue
+                parsed.append((name, timestamps, values))
+                parse_stage["rows"] += len(values)
+    for name, timestamps, values in parsed:
+        with profiler.stage(f"insert {name}") as insert_stage:
+            is_added = logic.add_new_pair_from_values(
+                name, timestamps, values, args.description
+            )
+            insert_stage["rows"] = len(values) if is_added else 0
+        print(f"{name}: {len(values) if is_added else 0} rows added")
+        failed += not is_added
+    return 1 if failed else 0
+
+
+def command_export(logic: RateProphetLogic, args, profiler: StageProfiler) -> int:
+    """
+    Exports a datetime range of a pair to CSV in the import format.
+    """
+    logic.model.get_data_version(args.pair)  # raises before the output is truncated
+    output = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    try:
+        with profiler.stage(f"export {args.pair}") as export_stage:
+            header = True
+            for timestamps, values in logic.model.iter_values(
+                args.pair, args.start, args.end
+            ):
+                pd.DataFrame({"timestamp": timestamps, "value": values}).to_csv(
+                    output,
+                    header=header,
+                    index=False,
+                    date_format="%Y-%m-%d %H:%M:%S",
+                )
+                header = False
+                export_stage["rows"] += len(values)
+        if header:
+            output.write("timestamp,value\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 0
+
+
+def command_snapshot(logic: RateProphetLogic, args, profiler: StageProfiler) -> int:
+    """
+    Exports or imports a columnar snapshot (see util_snapshot).
+    """
+    with profiler.stage(f"snapshot {args.action}") as snapshot_stage:
+        if args.action == "export":
+            rows = logic.model.export_snapshot(args.directory, args.pairs)
+        else:
+            rows = logic.model.import_snapshot(args.directory, args.pairs)
+        snapshot_stage["rows"] = rows
+    print(f"{rows} rows {args.action}ed")
+    return 0
+
+
+def command_pairs(logic: RateProphetLogic, args, profiler: StageProfiler) -> int:
+    """
+    Lists, adds, updates or deletes currency pairs.
+    """
+    with profiler.stage(f"pairs {args.action}"):
+        if args.action == "list":
+            print(logic.model.get_pairs().to_string(index=False))
+            return 0
+        if args.action == "add":
+            is_done = logic.model.add_pair(args.name, args.description)
+        elif args.action == "update":
+            is_done = logic.model.update_pair(args.name, args.description)
+        else:
+            is_done = logic.delete_selected_pair(args.name)
+    print(f"{args.name}: {args.action} {'done' if is_done else 'failed'}")
+    return 0 if is_done else 1
+
+
+def command_serve(logic: RateProphetLogic, args, profiler: StageProfiler) -> int:
+    """
+    Runs the read-only HTTP query service until interrupted.
+    """
+    serve(args.db, args.host, args.port, args.pool_size, args.quiet)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Builds the argument parser with all subcommands.
+    """
+    parser = argparse.ArgumentParser(
+        prog="rate_prophet", description="Rate Prophet headless batch jobs"
+    )
+    parser.add_argument("--db", default="config.db", help="SQLite database file")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="print per stage timings and throughput to stderr",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="bulk import CSV files")
+    import_parser.add_argument(
+        "sources",
+        nargs="+",
+        help="CSV file as NAME=PATH, or PATH to use the file name as pair name",
+    )
+    import_parser.add_argument("--jobs", type=int, default=None)
+    import_parser.add_argument("--description", default="")
+    import_parser.set_defaults(handler=command_import)
+
+    export_parser = commands.add_parser("export", help="export a range to CSV")
+    export_parser.add_argument("pair")
+    export_parser.add_argument(
+        "--start", type=datetime.fromisoformat, default=datetime(1970, 1, 1)
+    )
+    export_parser.add_argument(
+        "--end", type=datetime.fromisoformat, default=datetime.now()
+    )
+    export_parser.add_argument("--output", default="-", help="file, '-' for stdout")
+    export_parser.set_defaults(handler=command_export)
+
+    snapshot_parser = commands.add_parser("snapshot", help="columnar snapshots")
+    snapshot_parser.add_argument("action", choices=["export", "import"])
+    snapshot_parser.add_argument("directory")
+    snapshot_parser.add_argument("--pairs", nargs="+", default=None)
+    snapshot_parser.set_defaults(handler=command_snapshot)
+
+    pairs_parser = commands.add_parser("pairs", help="pair maintenance")
+    pairs_parser.add_argument("action", choices=["list", "add", "update", "delete"])
+    pairs_parser.add_argument("name", nargs="?")
+    pairs_parser.add_argument("--description", default="")
+    pairs_parser.set_defaults(handler=command_pairs)
+
+    serve_parser = commands.add_parser("serve", help="read-only HTTP query service")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8000)
+    serve_parser.add_argument("--pool-size", type=int, default=4)
+    serve_parser.add_argument("--quiet", action="store_true", help="no request log")
+    serve_parser.set_defaults(handler=command_serve)
+
+    return parser
+
+
+def main(argv: list[str] = None) -> int:
+    """
+    Runs the command line interface.
+
+    Returns:
+    - Process exit code.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "pairs" and args.action != "list" and args.name is None:
+        parser.error(f"pairs {args.action} requires a pair name")
+
+    profiler = StageProfiler(args.profile)
+    with profiler.stage("open database"):
+        logic = RateProphetLogic(SQLiteModel(db_name=args.db))
+    try:
+        return args.handler(logic, args, profiler)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        logic.model.conn.close()
+        profiler.report()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,346 @@
+"""
+ App read-only HTTP query service
+
+ GET /pairs
+     JSON list of pairs with their data versions.
+ GET /values?pair=ABC/DEF[&start=ISO][&end=ISO][&format=json|binary]
+             [&freq=h][&max_points=N][&aggregation=mean]
+     Values of a pair. "binary" is little-endian int64 timestamps (seconds since
+     epoch) followed by little-endian float64 values, row count in X-Row-Count.
+     "freq" resamples to a regular grid (empty cells dropped), "max_points" reduces
+     the result to at most N points.
+
+ Responses carry ETag/Last-Modified based on the pair data version (the ETag also
+ on the query parameters), so repeated requests with If-None-Match/If-Modified-Since
+ get 304 Not Modified. Last-Modified is only sent for changes older than the current
+ second.
+"""
+
+import json
+import queue
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, Optional
+from urllib.parse import parse_qs, urlparse
+import numpy as np
+import pandas as pd
+from rate_prophet.model_db import SQLiteModel
+from rate_prophet.util_timeseries import (
+    AGGREGATIONS,
+    RegularGridResampler,
+    downsample_to_points,
+)
+
+RESPONSE_FORMATS = ("json", "binary")
+
+
+class SQLiteModelPool:
+    """
+    Fixed size pool of read-only SQLiteModel instances shared by request threads.
+    """
+
+    def __init__(self, db_name: str, size: int = 4):
+        """
+        Parameters:
+        - db_name: Name of the SQLite database file.
+        - size: Number of connections, requests beyond it wait for a free one.
+        """
+        self._models: queue.Queue = queue.Queue()
+        for _ in range(size):
+            self._models.put(SQLiteModel(db_name=db_name, read_only=True))
+        self.size = size
+
+    @contextmanager
+    def model(self) -> Iterator[SQLiteModel]:
+        """
+        Borrows a model for the enclosed block.
+        """
+        model = self._models.get()
+        try:
+            yield model
+        finally:
+            self._models.put(model)
+
+    def close(self):
+        """
+        Closes all connections (waits for borrowed ones to be returned).
+        """
+        for _ in range(self.size):
+            self._models.get().conn.close()
+
+
+def read_values(
+    model: SQLiteModel,
+    pair_name: str,
+    datetime_begin: datetime,
+    datetime_end: datetime,
+    freq: Optional[str] = None,
+    max_points: Optional[int] = None,
+    aggregation: str = "mean",
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Reads (and optionally downsamples) values of a pair in chunks.
+
+    Returns:
+    - A tuple (timestamps as datetime64[s], values as float64) of numpy arrays.
+    """
+    chunks = model.iter_values(pair_name, datetime_begin, datetime_end)
+    if freq:
+        resampler = RegularGridResampler(freq, aggregation, fill=None)
+        parts = [resampler.push(timestamps, values) for timestamps, values in chunks]
+        series = pd.concat(parts + [resampler.finish()]).dropna()
+        timestamps = series.index.values.astype("datetime64[s]")
+        values = series.to_numpy(dtype=np.float64)
+    else:
+        chunks = list(chunks)
+        timestamps = np.concatenate(
+            [np.empty(0, dtype="datetime64[s]")] + [chunk[0] for chunk in chunks]
+        )
+        values = np.concatenate(
+            [np.empty(0, dtype=np.float64)] + [chunk[1] for chunk in chunks]
+        )
+    if max_points is not None:
+        timestamps, values = downsample_to_points(
+            timestamps, values, max_points, aggregation
+        )
+    return timestamps, values
+
+
+def last_modified_validator(modified: Optional[datetime]) -> Optional[datetime]:
+    """
+    Returns the Last-Modified value (whole seconds) usable as a validator, or None.
+    HTTP dates have one second precision, so a change in the current second could be
+    followed by another one with the same date. Like a weak validator (RFC 7232,
+    2.2.2), the date is only used once the second of the change has passed.
+    """
+    if modified is None:
+        return None
+    modified_second = modified.replace(microsecond=0)
+    if modified_second >= datetime.now(timezone.utc).replace(microsecond=0):
+        return None
+    return modified_second
+
+
+class QueryRequestHandler(BaseHTTPRequestHandler):
+    """
+    Handles GET requests of the query service.
+    """
+
+    protocol_version = "HTTP/1.1"  # keep-alive, clients reuse connections
+    disable_nagle_algorithm = True  # headers and body are separate writes
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            if url.path == "/pairs":
+                self.send_pairs()
+            elif url.path == "/values":
+                self.send_values(params)
+            else:
+                self.send_error(HTTPStatus.NOT_FOUND, "Unknown path")
+        except ValueError as e:
+            if str(e) == "Pair not found":
+                self.send_error(HTTPStatus.NOT_FOUND, str(e))
+            else:
+                self.send_error(HTTPStatus.BAD_REQUEST, str(e))
+
+    def send_pairs(self):
+        """
+        Sends all pairs with data versions, ETag is a checksum of the body.
+        """
+        with self.server.pool.model() as model:
+            pairs = model.get_data_versions()
+        body = pairs.to_json(orient="records").encode()
+        etag = f'"pairs-{zlib.crc32(body):08x}"'
+        if self.is_not_modified(etag, None):
+            self.send_not_modified(etag, None)
+        else:
+            self.send_body(body, "application/json", etag, None)
+
+    def send_values(self, params: dict):
+        """
+        Sends values of a pair in the requested format.
+        """
+        pair_name = params.get("pair")
+        if not pair_name:
+            raise ValueError("Missing parameter: pair")
+        response_format = params.get("format", "json")
+        if response_format not in RESPONSE_FORMATS:
+            raise ValueError(f"Unknown format: {response_format}")
+        aggregation = params.get("aggregation", "mean")
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation: {aggregation}")
+        datetime_begin = datetime.fromisoformat(params.get("start", "1970-01-01"))
+        datetime_end = datetime.fromisoformat(params.get("end", "9999-12-31"))
+        max_points = int(params["max_points"]) if "max_points" in params else None
+
+        with self.server.pool.model() as model:
+            # Version is read before the values, so a concurrent write can only make
+            # the ETag older than the data (next request refetches), never newer
+            pair_id, version, modified = model.get_data_version(pair_name)
+            # Each representation (format, range, downsampling) needs its own ETag
+            representation = "|".join(
+                [
+                    response_format,
+                    datetime_begin.isoformat(),
+                    datetime_end.isoformat(),
+                    params.get("freq", ""),
+                    str(max_points),
+                    aggregation,
+                ]
+            )
+            etag = f'"{pair_id}-{version}-{zlib.crc32(representation.encode()):08x}"'
+            if self.is_not_modified(etag, modified):
+                self.send_not_modified(etag, modified)
+                return
+            timestamps, values = read_values(
+                model,
+                pair_name,
+                datetime_begin,
+                datetime_end,
+                params.get("freq"),
+                max_points,
+                aggregation,
+            )
+
+        if response_format == "binary":
+            body = (
+                timestamps.astype("<i8").tobytes() + values.astype("<f8").tobytes()
+            )
+            self.send_body(
+                body,
+                "application/octet-stream",
+                etag,
+                modified,
+                {"X-Row-Count": str(len(values))},
+            )
+        else:
+            body = json.dumps(
+                {
+                    "pair": pair_name,
+                    "version": version,
+                    # np.char.replace fails on empty arrays
+                    "timestamps": (
+                        np.char.replace(
+                            np.datetime_as_string(timestamps, unit="s"), "T", " "
+                        ).tolist()
+                        if len(timestamps)
+                        else []
+                    ),
+                    "values": values.tolist(),
+                }
+            ).encode()
+            self.send_body(body, "application/json", etag, modified)
+
+    def is_not_modified(self, etag: str, modified: Optional[datetime]) -> bool:
+        """
+        Evaluates conditional request headers, If-None-Match takes precedence.
+        """
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags
+        if_modified_since = self.headers.get("If-Modified-Since")
+        last_modified = last_modified_validator(modified)
+        if if_modified_since is not None and last_modified is not None:
+            try:
+                return last_modified <= parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def send_cache_headers(self, etag: str, modified: Optional[datetime]):
+        self.send_header("ETag", etag)
+        last_modified = last_modified_validator(modified)
+        if last_modified is not None:
+            self.send_header(
+                "Last-Modified", format_datetime(last_modified, usegmt=True)
+            )
+        self.send_header("Cache-Control", "no-cache")
+
+    def send_not_modified(self, etag: str, modified: Optional[datetime]):
+        self.send_response(HTTPStatus.NOT_MODIFIED)
+        self.send_cache_headers(etag, modified)
+        self.end_headers()
+
+    def send_body(
+        self,
+        body: bytes,
+        content_type: str,
+        etag: str,
+        modified: Optional[datetime],
+        extra_headers: Optional[dict] = None,
+    ):
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_cache_headers(etag, modified)
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class QueryServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server serving read-only queries from a pool of SQLite connections.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        server_address: tuple[str, int],
+        db_name: str = "config.db",
+        pool_size: int = 4,
+        quiet: bool = False,
+    ):
+        """
+        Parameters:
+        - server_address: (host, port) to listen on, port 0 picks a free port.
+        - db_name: Name of the SQLite database file.
+        - pool_size: Number of pooled read-only connections.
+        - quiet: Disables request logging.
+        """
+        # Schema must exist before read-only connections open the database. WAL lets
+        # the readers run without blocking the app writing to the same file.
+        model = SQLiteModel(db_name=db_name)
+        model.cursor.execute("PRAGMA journal_mode=WAL")
+        model.conn.close()
+
+        self.pool = SQLiteModelPool(db_name, pool_size)
+        self.quiet = quiet
+        super().__init__(server_address, QueryRequestHandler)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.close()
+
+
+def serve(
+    db_name: str = "config.db",
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    pool_size: int = 4,
+    quiet: bool = False,
+):
+    """
+    Runs the query service until interrupted.
+    """
+    server = QueryServer((host, port), db_name, pool_size, quiet)
+    print(f"Serving {db_name} on http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
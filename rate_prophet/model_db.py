@@ -2,10 +2,23 @@
  App Model
 """
 
+import os
 import sqlite3
-from typing import Union
+from itertools import repeat
+from pathlib import Path
+from typing import Iterator, Optional, Union
+import numpy as np
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timezone
+from rate_prophet.util_snapshot import (
+    load_snapshot_pair,
+    open_snapshot_arrays,
+    pair_file_names,
+    read_manifest,
+    write_manifest,
+)
+
+SNAPSHOT_CHUNK_SIZE = 500_000
 
 
 class SQLiteModel:
@@ -13,16 +26,25 @@ class SQLiteModel:
     Models for SQlite interaction
     """
 
-    def __init__(self, db_name="config.db"):
+    def __init__(self, db_name="config.db", read_only: bool = False):
         """
         Initializes the database connection and creates tables if they don't exist.
         Parameters:
             param db_name: Name of the SQLite database file.
+            param read_only: Opens an existing database without write access (schema is not created).
         """
         self.db_name = db_name
-        self.conn = sqlite3.connect(self.db_name, check_same_thread=False)
-        self.cursor = self.conn.cursor()
-        self.create_table()
+        if read_only:
+            self.conn = sqlite3.connect(
+                Path(self.db_name).absolute().as_uri() + "?mode=ro",
+                uri=True,
+                check_same_thread=False,
+            )
+            self.cursor = self.conn.cursor()
+        else:
+            self.conn = sqlite3.connect(self.db_name, check_same_thread=False)
+            self.cursor = self.conn.cursor()
+            self.create_table()
 
     def create_table(self):
         """
@@ -50,8 +72,109 @@ class SQLiteModel:
         );
         """
         )
+        self.cursor.execute(
+            """
+        CREATE TABLE IF NOT EXISTS "PairVersions" (
+            "pair_id"      INTEGER,
+            "version"      INTEGER NOT NULL,
+            "generation"   INTEGER NOT NULL DEFAULT 0,
+            "modified"     DATETIME NOT NULL,
+            PRIMARY KEY("pair_id")
+        );
+        """
+        )
         self.conn.commit()
 
+    def _bump_data_version(self, pair_id: int, rewrite: bool = False):
+        """
+        Increments the data version of a pair, called in the transaction that changes its values.
+        The version backs ETag/Last-Modified of the HTTP query service. Rows are never deleted,
+        so a pair_id reused by SQLite after a pair is deleted continues with higher versions.
+        Parameters:
+            param pair_id: The id of the changed pair.
+            param rewrite: Data was not only appended (rows removed or inserted before the newest
+                one), increments the generation.
+        """
+        self.cursor.execute(
+            """
+            INSERT INTO PairVersions (pair_id, version, generation, modified)
+            VALUES (?, 1, ?, ?)
+            ON CONFLICT(pair_id) DO UPDATE SET
+                version = version + 1,
+                generation = generation + excluded.generation,
+                modified = excluded.modified
+            """,
+            (
+                pair_id,
+                int(rewrite),
+                datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f"),
+            ),
+        )
+
+    def _get_insert_mark(self, pair_id: int) -> tuple[Optional[int], Optional[str]]:
+        """
+        Returns (last rowid, newest timestamp of the pair), taken before inserting values.
+        """
+        self.cursor.execute('SELECT MAX(rowid) FROM "Values"')
+        last_rowid = self.cursor.fetchone()[0]
+        self.cursor.execute(
+            'SELECT MAX(timestamp) FROM "Values" WHERE pair_id = ?', (pair_id,)
+        )
+        return last_rowid, self.cursor.fetchone()[0]
+
+    def _is_backfill(
+        self, pair_id: int, insert_mark: tuple[Optional[int], Optional[str]]
+    ) -> bool:
+        """
+        Checks whether rows inserted after insert_mark are not newer than the pair's
+        previously newest row. Only the new rows (rowid above the mark) are scanned.
+        """
+        last_rowid, newest_timestamp = insert_mark
+        if newest_timestamp is None:
+            return False
+        self.cursor.execute(
+            """
+            SELECT 1 FROM "Values"
+            WHERE rowid > ? AND pair_id = ? AND timestamp <= ?
+            LIMIT 1
+            """,
+            (last_rowid or 0, pair_id, newest_timestamp),
+        )
+        return self.cursor.fetchone() is not None
+
+    def get_data_version(self, pair_name: str) -> tuple[int, int, Optional[datetime]]:
+        """
+        Retrieves the data version of a currency pair.
+
+        Parameters:
+        - pair_name: The name of the currency pair.
+
+        Returns:
+        - A tuple (pair_id, version, modified), version is 0 and modified None
+          if values of the pair were never changed through SQLiteModel.
+          (pair_id, version) never repeats for different data, modified is in UTC
+          with microsecond precision.
+        """
+        self.cursor.execute(
+            """
+            SELECT Pairs.pair_id, PairVersions.version, PairVersions.modified
+            FROM Pairs LEFT JOIN PairVersions ON Pairs.pair_id = PairVersions.pair_id
+            WHERE Pairs.name = ?
+            """,
+            (pair_name,),
+        )
+        row = self.cursor.fetchone()
+        if row is None:
+            raise ValueError("Pair not found")
+        pair_id, version, modified = row
+        if version is None:
+            return pair_id, 0, None
+        return (
+            pair_id,
+            version,
+            datetime.fromisoformat(modified).replace(tzinfo=timezone.utc),
+        )
+
     def add_pair(self, name: str, description: str) -> bool:
         """
         Adds a new currency pair to the Pairs table.
@@ -82,6 +205,48 @@ class SQLiteModel:
         query = "SELECT * FROM Pairs"
         return pd.read_sql_query(query, self.conn)
 
+    def get_data_generation(self, pair_name: str) -> tuple[int, int, int]:
+        """
+        Retrieves the data generation and version of a currency pair. The generation changes
+        when existing values (or the pair) are deleted or values are inserted before the
+        newest one, so a reader holding values of the same pair_id and generation can fetch
+        just the newer ones.
+
+        Parameters:
+        - pair_name: The name of the currency pair.
+
+        Returns:
+        - A tuple (pair_id, generation, version).
+        """
+        self.cursor.execute(
+            """
+            SELECT Pairs.pair_id, IFNULL(PairVersions.generation, 0),
+                   IFNULL(PairVersions.version, 0)
+            FROM Pairs LEFT JOIN PairVersions ON Pairs.pair_id = PairVersions.pair_id
+            WHERE Pairs.name = ?
+            """,
+            (pair_name,),
+        )
+        row = self.cursor.fetchone()
+        if row is None:
+            raise ValueError("Pair not found")
+        return row
+
+    def get_data_versions(self) -> pd.DataFrame:
+        """
+        Retrieves all currency pairs with their data versions (see get_data_version).
+
+        Returns:
+            A pandas DataFrame with columns name, description, version and modified.
+        """
+        query = """
+            SELECT Pairs.name, Pairs.description,
+                   IFNULL(PairVersions.version, 0) AS version, PairVersions.modified
+            FROM Pairs LEFT JOIN PairVersions ON Pairs.pair_id = PairVersions.pair_id
+            ORDER BY Pairs.pair_id
+            """
+        return pd.read_sql_query(query, self.conn)
+
     def delete_pair(self, name: str) -> bool:
         """
         Deletes a currency pair from the Pairs table by name.
@@ -91,9 +256,15 @@ class SQLiteModel:
             return: True if the pair was deleted successfully, False otherwise.
         """
         try:
+            self.cursor.execute("SELECT pair_id FROM Pairs WHERE name = ?", (name,))
+            pair_id = self.cursor.fetchone()
             self.cursor.execute("DELETE FROM Pairs WHERE name = ?", (name,))
+            is_deleted = self.cursor.rowcount > 0
+            if pair_id is not None:
+                # A pair re-created with the same (reused) pair_id must not repeat a version
+                self._bump_data_version(pair_id[0], rewrite=True)
             self.conn.commit()
-            return True if self.cursor.rowcount > 0 else False
+            return is_deleted
         except sqlite3.Error as e:
             print(f"Error updating pair: {e}")
             return False
@@ -105,7 +276,7 @@ class SQLiteModel:
             param name: The name of the currency pair.
             param description: The new description of the currency pair.
         Returns:
-            return: True if the update was successful, False otherwise.
+            return: True if the pair was found and updated, False otherwise.
         """
         try:
             self.cursor.execute(
@@ -115,7 +286,7 @@ class SQLiteModel:
         except sqlite3.Error as e:
             print(f"Error updating pair: {e}")
             return False
-        return True
+        return self.cursor.rowcount > 0
 
     def add_values(self, pair_name: str, timeseries: pd.Series) -> bool:
         """
@@ -139,6 +310,7 @@ class SQLiteModel:
                 raise ValueError("Pair not found")
 
             with self.conn:
+                insert_mark = self._get_insert_mark(pair_id[0])
                 for timestamp, value in timeseries.items():
                     # Ensure timestamp is in the correct format for SQLite
                     formatted_timestamp = (
@@ -150,6 +322,9 @@ class SQLiteModel:
                         'INSERT INTO "Values" (timestamp, value, pair_id) VALUES (?, ?, ?)',
                         (formatted_timestamp, value, pair_id[0]),
                     )
+                self._bump_data_version(
+                    pair_id[0], rewrite=self._is_backfill(pair_id[0], insert_mark)
+                )
             return True
         except (sqlite3.Error, ValueError) as e:
             print(f"Error adding values: {e}")
@@ -187,10 +362,13 @@ class SQLiteModel:
                 "DELETE FROM 'Values' WHERE pair_id = ? AND timestamp >= ? AND timestamp <= ?",
                 (pair_id[0], datetime_begin_str, datetime_end_str),
             )
+            deleted_rows = self.cursor.rowcount
+            if deleted_rows > 0:
+                self._bump_data_version(pair_id[0], rewrite=True)
             self.conn.commit()
 
             # Return the number of rows deleted
-            return self.cursor.rowcount
+            return deleted_rows
         except (sqlite3.Error, ValueError) as e:
             print(f"Error deleting values: {e}")
             return 0
@@ -228,7 +406,65 @@ class SQLiteModel:
         self.cursor.execute(query, (pair_id[0], datetime_begin_str, datetime_end_str))
         rows = self.cursor.fetchall()
 
-        # Convert the query results to a pandas Series
+        return self._rows_to_series(rows)
+
+    def get_values_after(self, pair_name: str, datetime_after: datetime) -> pd.Series:
+        """
+        Retrieves values for a specific currency pair newer than a given timestamp.
+        Used for incremental refreshes, the cost depends only on the number of new rows.
+
+        Parameters:
+        - pair_name: The name of the currency pair.
+        - datetime_after: The last timestamp already seen (exclusive).
+
+        Returns:
+        - A pandas Series containing the values with the datetime as the index.
+        """
+        datetime_after_str = datetime_after.strftime("%Y-%m-%d %H:%M:%S")
+
+        self.cursor.execute("SELECT pair_id FROM Pairs WHERE name = ?", (pair_name,))
+        pair_id = self.cursor.fetchone()
+        if pair_id is None:
+            raise ValueError("Pair not found")
+
+        query = """
+                SELECT timestamp, value FROM 'Values'
+                WHERE pair_id = ? AND timestamp > ?
+                ORDER BY timestamp ASC
+                """
+        self.cursor.execute(query, (pair_id[0], datetime_after_str))
+        return self._rows_to_series(self.cursor.fetchall())
+
+    def get_latest_values(self, pair_name: str, count: int) -> pd.Series:
+        """
+        Retrieves the newest values for a specific currency pair.
+
+        Parameters:
+        - pair_name: The name of the currency pair.
+        - count: Maximum number of values to return.
+
+        Returns:
+        - A pandas Series containing the values in ascending order with the datetime as the index.
+        """
+        self.cursor.execute("SELECT pair_id FROM Pairs WHERE name = ?", (pair_name,))
+        pair_id = self.cursor.fetchone()
+        if pair_id is None:
+            raise ValueError("Pair not found")
+
+        query = """
+                SELECT timestamp, value FROM 'Values'
+                WHERE pair_id = ?
+                ORDER BY timestamp DESC
+                LIMIT ?
+                """
+        self.cursor.execute(query, (pair_id[0], count))
+        return self._rows_to_series(self.cursor.fetchall()[::-1])
+
+    @staticmethod
+    def _rows_to_series(rows: list[tuple]) -> pd.Series:
+        """
+        Converts (timestamp, value) query results to a pandas Series.
+        """
         if rows:
             timestamps, values = zip(
                 *rows
@@ -237,3 +473,221 @@ class SQLiteModel:
             return series
         else:
             return pd.Series()  # Return an empty Series if no data is found
+
+    def iter_values(
+        self,
+        pair_name: str,
+        datetime_begin: datetime,
+        datetime_end: datetime,
+        chunk_size: int = SNAPSHOT_CHUNK_SIZE,
+    ) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        """
+        Reads values for a specific currency pair within a datetime range in chunks.
+        Meant for streaming consumers (e.g. RegularGridResampler) that should not
+        materialize the whole range at once.
+
+        Parameters:
+        - pair_name: The name of the currency pair.
+        - datetime_begin: The start of the datetime range (inclusive).
+        - datetime_end: The end of the datetime range (inclusive).
+        - chunk_size: Maximum number of rows per chunk.
+
+        Returns:
+        - An iterator of (timestamps, values) numpy arrays, timestamps as datetime64[s]
+          in ascending order.
+        """
+        datetime_begin_str = datetime_begin.strftime("%Y-%m-%d %H:%M:%S")
+        datetime_end_str = datetime_end.strftime("%Y-%m-%d %H:%M:%S")
+
+        # Own cursor, so other queries can run while the iterator is consumed
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT pair_id FROM Pairs WHERE name = ?", (pair_name,))
+        pair_id = cursor.fetchone()
+        if pair_id is None:
+            raise ValueError("Pair not found")
+
+        cursor.execute(
+            """
+            SELECT timestamp, value FROM 'Values'
+            WHERE pair_id = ? AND timestamp >= ? AND timestamp <= ?
+            ORDER BY timestamp ASC
+            """,
+            (pair_id[0], datetime_begin_str, datetime_end_str),
+        )
+        while chunk := cursor.fetchmany(chunk_size):
+            timestamps, values = zip(*chunk)
+            yield (
+                pd.to_datetime(timestamps).values.astype("datetime64[s]"),
+                np.asarray(values, dtype=np.float64),
+            )
+
+    def add_values_bulk(
+        self, pair_name: str, timestamps: np.ndarray, values: np.ndarray
+    ) -> bool:
+        """
+        Adds many values for a specific currency pair in a single transaction.
+        Timestamps are formatted in a vectorized way and rows are inserted in chunks,
+        without building per-row pandas objects.
+
+        Parameters:
+            - pair_name: The name of the currency pair.
+            - timestamps: Array of timestamps convertible to datetime64[s].
+            - values: Array of values, same length as timestamps.
+
+        Returns:
+            - True if the values were added successfully, False otherwise.
+        """
+        assert len(timestamps) == len(values), "timestamps and values length differ"
+        try:
+            self.cursor.execute(
+                "SELECT pair_id FROM Pairs WHERE name = ?", (pair_name,)
+            )
+            pair_id = self.cursor.fetchone()
+            if pair_id is None:
+                raise ValueError("Pair not found")
+
+            with self.conn:
+                insert_mark = self._get_insert_mark(pair_id[0])
+                for start in range(0, len(timestamps), SNAPSHOT_CHUNK_SIZE):
+                    stop = start + SNAPSHOT_CHUNK_SIZE
+                    # Format as "YYYY-MM-DD HH:MM:SS" to match add_values
+                    formatted_timestamps = np.char.replace(
+                        np.datetime_as_string(
+                            np.asarray(timestamps[start:stop], dtype="datetime64[s]"),
+                            unit="s",
+                        ),
+                        "T",
+                        " ",
+                    )
+                    self.cursor.executemany(
+                        'INSERT INTO "Values" (timestamp, value, pair_id) VALUES (?, ?, ?)',
+                        zip(
+                            formatted_timestamps.tolist(),
+                            np.asarray(values[start:stop], dtype=np.float64).tolist(),
+                            repeat(pair_id[0]),
+                        ),
+                    )
+                self._bump_data_version(
+                    pair_id[0], rewrite=self._is_backfill(pair_id[0], insert_mark)
+                )
+            return True
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Error adding values: {e}")
+            return False
+
+    def export_snapshot(
+        self, directory: str, pair_names: Optional[list[str]] = None
+    ) -> int:
+        """
+        Exports currency pairs to a columnar snapshot (see util_snapshot).
+        Rows are streamed from the database in chunks straight into memory-mapped files.
+
+        Parameters:
+        - directory: The snapshot directory, created if it does not exist.
+        - pair_names: Names of the pairs to export, all pairs if None.
+
+        Returns:
+        - The number of rows exported.
+        """
+        pairs = self.get_pairs()
+        if pair_names is not None:
+            missing = set(pair_names) - set(pairs["name"])
+            if missing:
+                raise ValueError(f"Pair not found: {', '.join(sorted(missing))}")
+            pairs = pairs[pairs["name"].isin(pair_names)]
+
+        os.makedirs(directory, exist_ok=True)
+        entries = []
+        exported_rows = 0
+        cursor = self.conn.cursor()
+        for index, (pair_id, name, description) in enumerate(
+            pairs[["pair_id", "name", "description"]].itertuples(index=False)
+        ):
+            # Count and rows must come from the same database snapshot
+            cursor.execute("BEGIN")
+            try:
+                cursor.execute(
+                    "SELECT COUNT(*) FROM 'Values' WHERE pair_id = ?", (int(pair_id),)
+                )
+                rows = cursor.fetchone()[0]
+                timestamps, values = open_snapshot_arrays(directory, index, rows)
+                cursor.execute(
+                    "SELECT timestamp, value FROM 'Values' WHERE pair_id = ? ORDER BY timestamp ASC",
+                    (int(pair_id),),
+                )
+                position = 0
+                while chunk := cursor.fetchmany(SNAPSHOT_CHUNK_SIZE):
+                    chunk_timestamps, chunk_values = zip(*chunk)
+                    stop = position + len(chunk)
+                    timestamps[position:stop] = pd.to_datetime(
+                        chunk_timestamps
+                    ).values.astype("datetime64[s]")
+                    values[position:stop] = chunk_values
+                    position = stop
+            finally:
+                cursor.execute("COMMIT")
+            timestamps.flush()
+            values.flush()
+            del timestamps, values
+            if position != rows:
+                raise ValueError(
+                    f"Snapshot of {name} has {position} rows, expected {rows}"
+                )
+
+            timestamps_file, values_file = pair_file_names(index)
+            entries.append(
+                {
+                    "name": name,
+                    "description": description,
+                    "rows": rows,
+                    "timestamps": timestamps_file,
+                    "values": values_file,
+                }
+            )
+            exported_rows += rows
+        write_manifest(directory, entries)
+        return exported_rows
+
+    def import_snapshot(
+        self, directory: str, pair_names: Optional[list[str]] = None
+    ) -> int:
+        """
+        Imports currency pairs from a columnar snapshot through the bulk insert path.
+        Pairs that do not exist are created, existing pairs get the values appended.
+        Each pair is imported all or nothing, a pair created for a failed import is removed.
+
+        Parameters:
+        - directory: The snapshot directory.
+        - pair_names: Names of the pairs to import, all pairs in the snapshot if None.
+
+        Returns:
+        - The number of rows imported.
+
+        Raises:
+        - ValueError if any pair could not be imported (the other pairs stay imported).
+        """
+        manifest = read_manifest(directory)
+        existing_pairs = set(self.get_pairs()["name"])
+        imported_rows = 0
+        failed_pairs = []
+        for entry in manifest["pairs"]:
+            if pair_names is not None and entry["name"] not in pair_names:
+                continue
+            is_created = entry["name"] not in existing_pairs
+            if is_created:
+                self.add_pair(entry["name"], entry["description"])
+            timestamps, values = load_snapshot_pair(
+                directory, entry["name"], manifest
+            )
+            if self.add_values_bulk(entry["name"], timestamps, values):
+                imported_rows += entry["rows"]
+            else:
+                if is_created:
+                    self.delete_pair(entry["name"])
+                failed_pairs.append(entry["name"])
+        if failed_pairs:
+            raise ValueError(
+                f"Snapshot import failed for: {', '.join(failed_pairs)} "
+                f"({imported_rows} rows of other pairs imported)"
+            )
+        return imported_rows
@@ -5,7 +5,6 @@
 import re
 import pandas as pd
 import streamlit as st
-from rate_prophet.util_timeseries import create_timeseries
 from datetime import datetime
 from rate_prophet.view_ui_simple import (
     main_page_view,
@@ -14,25 +13,33 @@ from rate_prophet.view_ui_simple import (
     currency_manager_view,
     footer_view,
 )
-from rate_prophet.model_db import SQLiteModel
 from rate_prophet.config_utils import AppPage
+from rate_prophet.model_db import SQLiteModel
+from rate_prophet.rate_prophet_logic import RateProphetLogic
+from rate_prophet.util_timeseries import TimeseriesRingBuffer
 
 
 # Controller
-class RateProphetController:
+class RateProphetController(RateProphetLogic):
     """
     A controller for the RateProphet application, handling the core logic,
     data manipulation, and interaction between the user interface and the database model.
+    Data manipulation itself is inherited from RateProphetLogic.
     """
 
-    def __init__(self):
-        self.model: SQLiteModel = SQLiteModel()
+    def __init__(self, model: SQLiteModel = None):
+        super().__init__(model)
         self.current_page: AppPage = None
         self.visualisation_type: str = None
         self.selected_currency_pair: str = None
         self.start_date: datetime = None
         self.end_date: datetime = None
         self.message: str = None
+        self.auto_refresh: bool = False
+        self.refresh_interval: float = 5.0  # seconds
+        self.live_buffer_capacity: int = 10_000
+        self.live_buffers: dict[str, TimeseriesRingBuffer] = {}
+        self.live_data_versions: dict[str, tuple[int, int, int]] = {}
         self.initialise()
 
     def initialise(self):
@@ -46,39 +53,6 @@ class RateProphetController:
         self.end_date = datetime.now()
         self.start_date = self.end_date - pd.DateOffset(years=5)
 
-    def add_predefied_pair(self):
-        """
-        Adds predefied currency pair with values to database.
-        """
-        datetime_begin = datetime(2022, 1, 2)
-        datetime_end = datetime(2022, 1, 7)
-        pts = create_timeseries(datetime_begin, datetime_end)
-        self.model.add_pair("XYZ/FKE", "Predefied test pair")
-        self.model.add_values("XYZ/FKE", pts)
-
-    def add_new_pair_from_csv(self, file, name, description="") -> bool:
-        """
-        Adds provided currency pair with values to database.
-        """
-        if file and name:
-            values = pd.read_csv(file)["value"]
-            self.model.add_pair(name, description)  # TODO: no transaction!!!!
-            self.model.add_values(name, values)
-            return True
-        return False
-
-    def delete_selected_pair(self, selected_pair):
-        """
-        Deletes selected pair from database. Deletes all data.
-
-        Parameters:
-               selected_pair (str): The name of the currency pair.
-        """
-        start = datetime(1970, 1, 1)  # Unix Epoch
-        end = datetime.now()
-        self.model.delete_values(selected_pair, start, end)
-        self.model.delete_pair(selected_pair)
-
     def draw_left_menu(self):
         """
         draws and manages left panel, reruns if any changes are made in the left panel.
@@ -92,6 +66,7 @@ class RateProphetController:
             selected_start_date=self.start_date,
             selected_end_date=self.end_date,
             selected_page=self.current_page,
+            selected_auto_refresh=self.auto_refresh,
         )
 
         if self.selected_currency_pair != left_panel_options["selected_pair"]:
@@ -106,6 +81,9 @@ class RateProphetController:
         if self.end_date != left_panel_options["end_date"]:
             self.end_date = left_panel_options["end_date"]
             modified = True
+        if self.auto_refresh != left_panel_options["auto_refresh"]:
+            self.auto_refresh = left_panel_options["auto_refresh"]
+            modified = True
         if left_panel_options["selected_page"] is not None:
             self.change_page(left_panel_options["selected_page"])
 
@@ -133,6 +111,51 @@ class RateProphetController:
                 self.message = "Data validation error"
                 st.rerun()
 
+    def refresh_live_buffer(self, pair_name: str) -> TimeseriesRingBuffer:
+        """
+        Fetches only values newer than the last timestamp seen for the pair and appends
+        them to the pair's session held ring buffer. The buffer is reloaded with the newest
+        values (up to its capacity) on first use and whenever existing values of the pair
+        were deleted or the pair was re-created, i.e. its data generation changed.
+
+        Parameters:
+               pair_name (str): The name of the currency pair.
+        """
+        pair_id, generation, version = self.model.get_data_generation(pair_name)
+        buffer = self.live_buffers.get(pair_name)
+        known_version = self.live_data_versions.get(pair_name)
+        if buffer is None or known_version[:2] != (pair_id, generation):
+            buffer = TimeseriesRingBuffer(self.live_buffer_capacity)
+            self.live_buffers[pair_name] = buffer
+            buffer.append(self.model.get_latest_values(pair_name, buffer.capacity))
+        elif known_version[2] != version and buffer.last_timestamp is not None:
+            buffer.append(
+                self.model.get_values_after(pair_name, buffer.last_timestamp)
+            )
+        elif known_version[2] != version:
+            buffer.append(self.model.get_latest_values(pair_name, buffer.capacity))
+        # Version is read before the values, a concurrent write is fetched next time
+        self.live_data_versions[pair_name] = (pair_id, generation, version)
+        return buffer
+
+    def draw_live_main_page(self, all_pairs):
+        """
+        Draws the main page in auto refresh mode. Only the chart fragment reruns every
+        refresh_interval seconds, so the refresh cost depends on the new values and the
+        buffer capacity, not on the length of the history.
+        """
+
+        @st.fragment(run_every=self.refresh_interval)
+        def live_chart():
+            buffer = self.refresh_live_buffer(self.selected_currency_pair)
+            main_page_view(
+                current_pair_values=buffer.to_series(name=self.selected_currency_pair),
+                all_pairs=all_pairs,
+                visualisation_type=self.visualisation_type,
+            )
+
+        live_chart()
+
     def change_page(self, page: AppPage):
         """
         Changes the current page of the RateProphet application.
@@ -149,7 +172,9 @@ class RateProphetController:
         header_view(self.message)
         self.draw_left_menu()
 
-        if self.current_page == AppPage.MAIN_PAGE:
+        if self.current_page == AppPage.MAIN_PAGE and self.auto_refresh:
+            self.draw_live_main_page(self.model.get_pairs())
+        elif self.current_page == AppPage.MAIN_PAGE:
             all_pairs = self.model.get_pairs()
             current_pair_values = self.model.get_values(
                 pair_name=self.selected_currency_pair,
@@ -0,0 +1,80 @@
+"""
+ App Logic (UI independent part of the controller)
+"""
+
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from rate_prophet.util_timeseries import create_timeseries
+from rate_prophet.model_db import SQLiteModel
+
+
+class RateProphetLogic:
+    """
+    Data manipulation logic of the RateProphet application, usable without the UI
+    (e.g. from the command line interface).
+    """
+
+    def __init__(self, model: SQLiteModel = None):
+        self.model: SQLiteModel = model if model is not None else SQLiteModel()
+
+    def add_predefied_pair(self):
+        """
+        Adds predefied currency pair with values to database.
+        """
+        datetime_begin = datetime(2022, 1, 2)
+        datetime_end = datetime(2022, 1, 7)
+        pts = create_timeseries(datetime_begin, datetime_end)
+        self.model.add_pair("XYZ/FKE", "Predefied test pair")
+        self.model.add_values("XYZ/FKE", pts)
+
+    def add_new_pair_from_csv(self, file, name, description="") -> bool:
+        """
+        Adds provided currency pair with values to database.
+        """
+        if file and name:
+            values = pd.read_csv(file)["value"]
+            self.model.add_pair(name, description)  # TODO: no transaction!!!!
+            self.model.add_values(name, values)
+            return True
+        return False
+
+    def add_new_pair_from_values(
+        self,
+        name: str,
+        timestamps: np.ndarray,
+        values: np.ndarray,
+        description: str = "",
+    ) -> bool:
+        """
+        Adds provided currency pair (if missing) with values to database using the bulk path.
+        A pair created here is removed again if the values cannot be added.
+
+        Parameters:
+            name (str): The name of the currency pair.
+            timestamps (np.ndarray): Timestamps convertible to datetime64[s].
+            values (np.ndarray): Values, same length as timestamps.
+            description (str): Description used if the pair is created.
+        """
+        is_created = name not in set(self.model.get_pairs()["name"])
+        if is_created:
+            self.model.add_pair(name, description)
+        if self.model.add_values_bulk(name, timestamps, values):
+            return True
+        if is_created:  # do not leave an empty pair behind
+            self.model.delete_pair(name)
+        return False
+
+    def delete_selected_pair(self, selected_pair) -> bool:
+        """
+        Deletes selected pair from database. Deletes all data.
+
+        Parameters:
+               selected_pair (str): The name of the currency pair.
+        Returns:
+               True if the pair was deleted, False otherwise (e.g. it does not exist).
+        """
+        start = datetime(1970, 1, 1)  # Unix Epoch
+        end = datetime.now()
+        self.model.delete_values(selected_pair, start, end)
+        return self.model.delete_pair(selected_pair)
@@ -0,0 +1,118 @@
+"""
+ Columnar snapshot format
+
+ A snapshot is a directory holding one pair of NumPy ``.npy`` files per
+ currency pair (``datetime64[s]`` timestamps and little-endian ``float64``
+ values) plus a ``manifest.json`` describing them. The arrays can be opened
+ zero-copy with ``numpy.memmap`` for analytics.
+"""
+
+import json
+import os
+from typing import Optional
+import numpy as np
+
+SNAPSHOT_FORMAT_VERSION = 1
+MANIFEST_FILE_NAME = "manifest.json"
+TIMESTAMP_DTYPE = np.dtype("datetime64[s]")
+VALUE_DTYPE = np.dtype("<f8")
+
+
+def pair_file_names(index: int) -> tuple[str, str]:
+    """
+    Returns the timestamp and value file names used for the pair at given position.
+    Pair names (e.g. "ABC/DEF") are not safe file names, so files are numbered.
+    """
+    return f"pair_{index:04d}_timestamps.npy", f"pair_{index:04d}_values.npy"
+
+
+def open_snapshot_arrays(
+    directory: str, index: int, rows: int
+) -> tuple[np.memmap, np.memmap]:
+    """
+    Creates writable memory-mapped timestamp and value arrays for a pair.
+
+    Parameters:
+    - directory: The snapshot directory.
+    - index: Position of the pair in the manifest.
+    - rows: Number of rows to allocate.
+
+    Returns:
+    - A tuple (timestamps, values) of writable memory-mapped arrays.
+    """
+    timestamps_file, values_file = pair_file_names(index)
+    timestamps = np.lib.format.open_memmap(
+        os.path.join(directory, timestamps_file),
+        mode="w+",
+        dtype=TIMESTAMP_DTYPE,
+        shape=(rows,),
+    )
+    values = np.lib.format.open_memmap(
+        os.path.join(directory, values_file),
+        mode="w+",
+        dtype=VALUE_DTYPE,
+        shape=(rows,),
+    )
+    return timestamps, values
+
+
+def write_manifest(directory: str, pairs: list[dict]):
+    """
+    Writes the snapshot manifest.
+
+    Parameters:
+    - directory: The snapshot directory.
+    - pairs: List of pair entries (name, description, rows, timestamps, values).
+    """
+    manifest = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "timestamp_dtype": TIMESTAMP_DTYPE.str,
+        "value_dtype": VALUE_DTYPE.str,
+        "pairs": pairs,
+    }
+    with open(os.path.join(directory, MANIFEST_FILE_NAME), "w") as file:
+        json.dump(manifest, file, indent=2)
+
+
+def read_manifest(directory: str) -> dict:
+    """
+    Reads and validates the snapshot manifest.
+
+    Returns:
+    - The manifest as a dictionary.
+    """
+    with open(os.path.join(directory, MANIFEST_FILE_NAME)) as file:
+        manifest = json.load(file)
+    if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported snapshot format version: {manifest.get('format_version')}"
+        )
+    return manifest
+
+
+def load_snapshot_pair(
+    directory: str, pair_name: str, manifest: Optional[dict] = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Opens timestamps and values of a single pair from a snapshot without copying.
+
+    Parameters:
+    - directory: The snapshot directory.
+    - pair_name: The name of the currency pair.
+    - manifest: Already read manifest, read from the directory if not provided.
+
+    Returns:
+    - A tuple (timestamps, values) of read-only memory-mapped arrays.
+    """
+    if manifest is None:
+        manifest = read_manifest(directory)
+    for entry in manifest["pairs"]:
+        if entry["name"] == pair_name:
+            timestamps = np.load(
+                os.path.join(directory, entry["timestamps"]), mmap_mode="r"
+            )
+            values = np.load(os.path.join(directory, entry["values"]), mmap_mode="r")
+            if len(timestamps) != entry["rows"] or len(values) != entry["rows"]:
+                raise ValueError(f"Snapshot arrays of {pair_name} are corrupted")
+            return timestamps, values
+    raise ValueError("Pair not found")
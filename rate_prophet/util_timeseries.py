@@ -1,3 +1,4 @@
+from typing import Optional
 import pandas as pd
 import numpy as np
 
@@ -45,3 +46,318 @@ def create_timeseries(
     timeseries = pd.Series(data=noisy_sine_wave, index=date_range, name=name).abs()
 
     return timeseries
+
+
+AGGREGATIONS = ("first", "last", "mean", "min", "max")
+FILL_METHODS = (None, "ffill", "interpolate")
+
+
+def _frequency_seconds(freq: str) -> int:
+    """
+    Converts a fixed pandas frequency string (e.g. "h", "15min", "D") to seconds.
+    """
+    nanos = pd.tseries.frequencies.to_offset(freq).nanos
+    if nanos <= 0:
+        raise ValueError(f"Frequency must be positive: {freq}")
+    if nanos % 10**9 != 0:
+        raise ValueError(f"Frequency must be a whole number of seconds: {freq}")
+    return nanos // 10**9
+
+
+def _aggregate_groups(
+    values: np.ndarray, starts: np.ndarray, aggregation: str
+) -> np.ndarray:
+    """
+    Aggregates consecutive groups of values, each group begins at an index in starts.
+    """
+    ends = np.r_[starts[1:], len(values)]
+    if aggregation == "first":
+        return values[starts]
+    if aggregation == "last":
+        return values[ends - 1]
+    if aggregation == "mean":
+        return np.add.reduceat(values, starts) / (ends - starts)
+    if aggregation == "min":
+        return np.minimum.reduceat(values, starts)
+    return np.maximum.reduceat(values, starts)
+
+
+class RegularGridResampler:
+    """
+    Streaming resampler aligning irregular timeseries chunks to a regular grid.
+
+    Chunks of ascending timestamps are pushed one after another (e.g. from
+    SQLiteModel.iter_values). Rows falling into the same grid cell are aggregated,
+    empty cells are recorded as gaps and filled. The last cell of each chunk is held
+    back until the next chunk proves it complete, so chunk boundaries do not affect
+    the result. All work is done on numpy arrays.
+    """
+
+    def __init__(self, freq: str = "h", aggregation: str = "last", fill="ffill"):
+        """
+        Parameters:
+        - freq: Target grid frequency, a fixed pandas frequency string.
+        - aggregation: How rows in one cell are combined, one of AGGREGATIONS.
+        - fill: How empty cells are filled, one of FILL_METHODS (None leaves NaN).
+        """
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation: {aggregation}")
+        if fill not in FILL_METHODS:
+            raise ValueError(f"Unknown fill method: {fill}")
+        self.step = _frequency_seconds(freq)
+        self.aggregation = aggregation
+        self.fill = fill
+        self.gaps: list[tuple[int, int, int]] = []
+        self._pending_seconds = np.empty(0, dtype=np.int64)
+        self._pending_values = np.empty(0, dtype=np.float64)
+        self._last_cell: int = None
+        self._last_value: float = None
+
+    def push(self, timestamps: np.ndarray, values: np.ndarray) -> pd.Series:
+        """
+        Adds a chunk of rows and returns the part of the grid completed by it.
+
+        Parameters:
+        - timestamps: Ascending timestamps convertible to datetime64[s].
+        - values: Values, same length as timestamps.
+
+        Returns:
+        - A pandas Series on the regular grid (possibly empty).
+        """
+        seconds = np.asarray(timestamps, dtype="datetime64[s]").astype(np.int64)
+        values = np.asarray(values, dtype=np.float64)
+        if len(seconds) == 0:
+            return self._to_series(np.empty(0, dtype=np.int64), values)
+        if np.any(np.diff(seconds) < 0):
+            raise ValueError("Timestamps in chunk must be ascending")
+        if (len(self._pending_seconds) and seconds[0] < self._pending_seconds[-1]) or (
+            self._last_cell is not None and seconds[0] // self.step <= self._last_cell
+        ):
+            raise ValueError("Chunk starts before the previous chunk ended")
+
+        seconds = np.concatenate((self._pending_seconds, seconds))
+        values = np.concatenate((self._pending_values, values))
+        cells = seconds // self.step
+        # Hold back rows of the last cell, the next chunk may continue it
+        held = np.searchsorted(cells, cells[-1], side="left")
+        self._pending_seconds = seconds[held:]
+        self._pending_values = values[held:]
+        return self._emit(cells[:held], values[:held])
+
+    def finish(self) -> pd.Series:
+        """
+        Flushes the held back cell.
+
+        Returns:
+        - The remaining part of the grid as a pandas Series.
+        """
+        cells = self._pending_seconds // self.step
+        values = self._pending_values
+        self._pending_seconds = np.empty(0, dtype=np.int64)
+        self._pending_values = np.empty(0, dtype=np.float64)
+        return self._emit(cells, values)
+
+    def get_gaps(self) -> pd.DataFrame:
+        """
+        Returns gaps found so far.
+
+        Returns:
+        - A pandas DataFrame with columns start, end (first and last missing grid
+          timestamp, inclusive) and missing (number of missing grid points).
+        """
+        gaps = np.array(self.gaps, dtype=np.int64).reshape(-1, 3)
+        return pd.DataFrame(
+            {
+                "start": pd.to_datetime(gaps[:, 0] * self.step, unit="s"),
+                "end": pd.to_datetime(gaps[:, 1] * self.step, unit="s"),
+                "missing": gaps[:, 2],
+            }
+        )
+
+    def _emit(self, cells: np.ndarray, values: np.ndarray) -> pd.Series:
+        """
+        Aggregates complete cells, records gaps and fills the grid.
+        """
+        if len(cells) == 0:
+            return self._to_series(cells, values)
+
+        starts = np.flatnonzero(np.r_[True, cells[1:] != cells[:-1]])
+        unique_cells = cells[starts]
+        aggregated = _aggregate_groups(values, starts, self.aggregation)
+
+        # Prepend the last emitted cell so gaps and fills continue across chunks
+        if self._last_cell is not None:
+            known_cells = np.r_[self._last_cell, unique_cells]
+            known_values = np.r_[self._last_value, aggregated]
+        else:
+            known_cells, known_values = unique_cells, aggregated
+
+        distances = np.diff(known_cells)
+        gap_positions = np.flatnonzero(distances > 1)
+        self.gaps.extend(
+            zip(
+                (known_cells[gap_positions] + 1).tolist(),
+                (known_cells[gap_positions + 1] - 1).tolist(),
+                (distances[gap_positions] - 1).tolist(),
+            )
+        )
+
+        first_cell = known_cells[0] if self._last_cell is None else known_cells[0] + 1
+        grid = np.arange(first_cell, known_cells[-1] + 1, dtype=np.int64)
+        if self.fill == "interpolate":
+            grid_values = np.interp(grid, known_cells, known_values)
+        elif self.fill == "ffill":
+            grid_values = known_values[
+                np.searchsorted(known_cells, grid, side="right") - 1
+            ]
+        else:
+            grid_values = np.full(len(grid), np.nan)
+            grid_values[known_cells[known_cells >= first_cell] - first_cell] = (
+                known_values[known_cells >= first_cell]
+            )
+
+        self._last_cell = int(known_cells[-1])
+        self._last_value = float(known_values[-1])
+        return self._to_series(grid, grid_values)
+
+    def _to_series(self, grid: np.ndarray, values: np.ndarray) -> pd.Series:
+        """
+        Builds a pandas Series indexed by grid timestamps.
+        """
+        index = pd.DatetimeIndex((grid * self.step).astype("datetime64[s]"))
+        return pd.Series(data=values, index=index, dtype=np.float64)
+
+
+def resample_to_grid(
+    values: pd.Series, freq: str = "h", aggregation: str = "last", fill="ffill"
+) -> tuple[pd.Series, pd.DataFrame]:
+    """
+    Aligns a timeseries (e.g. SQLiteModel.get_values output) to a regular grid.
+
+    Parameters:
+    - values: A pandas Series with a datetime index.
+    - freq: Target grid frequency, a fixed pandas frequency string.
+    - aggregation: How rows in one cell are combined, one of AGGREGATIONS.
+    - fill: How empty cells are filled, one of FILL_METHODS (None leaves NaN).
+
+    Returns:
+    - A tuple (regular series, gaps DataFrame), see RegularGridResampler.get_gaps.
+    """
+    resampler = RegularGridResampler(freq, aggregation, fill)
+    values = values.sort_index(kind="stable")
+    parts = [
+        resampler.push(values.index.values, values.values),
+        resampler.finish(),
+    ]
+    series = pd.concat(parts)
+    series.name = values.name
+    return series, resampler.get_gaps()
+
+
+def downsample_to_points(
+    timestamps: np.ndarray,
+    values: np.ndarray,
+    max_points: int,
+    aggregation: str = "mean",
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Reduces a timeseries to at most max_points by aggregating equally sized groups
+    of consecutive rows. Each group is labelled with its first timestamp.
+
+    Parameters:
+    - timestamps: Ascending timestamps.
+    - values: Values, same length as timestamps.
+    - max_points: Maximum number of resulting points.
+    - aggregation: How rows in one group are combined, one of AGGREGATIONS.
+
+    Returns:
+    - A tuple (timestamps, values) of numpy arrays.
+    """
+    if aggregation not in AGGREGATIONS:
+        raise ValueError(f"Unknown aggregation: {aggregation}")
+    if max_points < 1:
+        raise ValueError("max_points must be positive")
+    if len(values) <= max_points:
+        return timestamps, values
+    starts = np.unique(
+        np.linspace(0, len(values), max_points, endpoint=False).astype(np.int64)
+    )
+    return timestamps[starts], _aggregate_groups(
+        np.asarray(values, dtype=np.float64), starts, aggregation
+    )
+
+
+def find_gaps(values: pd.Series, freq: str = "h") -> pd.DataFrame:
+    """
+    Reports gaps in a timeseries relative to a regular grid.
+
+    Parameters:
+    - values: A pandas Series with a datetime index.
+    - freq: Expected frequency, a fixed pandas frequency string.
+
+    Returns:
+    - A pandas DataFrame with columns start, end and missing.
+    """
+    return resample_to_grid(values, freq, fill=None)[1]
+
+
+class TimeseriesRingBuffer:
+    """
+    Fixed capacity buffer of the newest timeseries values.
+    Appending overwrites the oldest values once the capacity is reached.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Parameters:
+        - capacity: Maximum number of values kept.
+        """
+        assert capacity > 0, "capacity must be positive"
+        self.capacity = capacity
+        self.size = 0
+        self._timestamps = np.empty(capacity, dtype="datetime64[ns]")
+        self._values = np.empty(capacity, dtype=np.float64)
+        self._end = 0  # next write position
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def last_timestamp(self) -> Optional[pd.Timestamp]:
+        """
+        The newest timestamp in the buffer, None if the buffer is empty.
+        """
+        if self.size == 0:
+            return None
+        return pd.Timestamp(self._timestamps[(self._end - 1) % self.capacity])
+
+    def append(self, values: pd.Series):
+        """
+        Appends values newer than the ones already in the buffer.
+
+        Parameters:
+        - values: A pandas Series with a datetime index in ascending order.
+        """
+        if len(values) == 0:
+            return
+        timestamps = values.index.values[-self.capacity :]
+        new_values = values.values[-self.capacity :]
+        positions = (self._end + np.arange(len(new_values))) % self.capacity
+        self._timestamps[positions] = timestamps
+        self._values[positions] = new_values
+        self._end = (self._end + len(new_values)) % self.capacity
+        self.size = min(self.size + len(new_values), self.capacity)
+
+    def to_series(self, name: str = None) -> pd.Series:
+        """
+        Returns the buffered values in ascending order.
+
+        Parameters:
+        - name: The name for the resulting Pandas Series.
+        """
+        positions = (self._end - self.size + np.arange(self.size)) % self.capacity
+        return pd.Series(
+            data=self._values[positions],
+            index=pd.DatetimeIndex(self._timestamps[positions]),
+            name=name,
+        )
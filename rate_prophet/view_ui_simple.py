@@ -40,6 +40,7 @@ def plot_data(values: pd.Series, visualisation_type: str):
         plt.xticks(rotation=45)
         plt.tight_layout()
         st.pyplot(fig)
+        plt.close(fig)  # pyplot keeps figures alive until closed
 
 
 # -------------------- Views -------------------
@@ -97,6 +98,7 @@ def left_panel_view(
     selected_start_date: datetime,
     selected_end_date: datetime,
     selected_page: AppPage,
+    selected_auto_refresh: bool = False,
 ):
     """
     Renders the left panel for the main page.
@@ -143,6 +145,13 @@ def left_panel_view(
             ),
         )
 
+        st.markdown("---")
+
+        st.header("LIVE")
+        auto_refresh = st.checkbox(
+            "Auto refresh (newest values)", value=selected_auto_refresh
+        )
+
         new_page = None
         st.markdown("---")
         if selected_page == AppPage.MAIN_PAGE:
@@ -158,6 +167,7 @@ def left_panel_view(
             "end_date": end_date,
             "visualisation_type": visualisation_type,
             "selected_page": new_page,
+            "auto_refresh": auto_refresh,
         }
 
 
@@ -0,0 +1,8 @@
+import sys
+from rate_prophet.cli import main
+
+# Main execution
+if __name__ == "__main__":
+
+    # python run_cli.py --help
+    sys.exit(main())
@@ -0,0 +1,79 @@
+import argparse
+import http.client
+import threading
+import time
+from urllib.parse import urlparse
+import numpy as np
+
+
+def run_worker(url, requests_count, conditional, results, lock):
+    """
+    Sends requests over one keep-alive connection, records status and latency.
+    """
+    parsed = urlparse(url)
+    target = parsed.path + ("?" + parsed.query if parsed.query else "")
+    connection = http.client.HTTPConnection(parsed.hostname, parsed.port or 80)
+    etag = None
+    statuses, latencies, received = {}, [], 0
+    for _ in range(requests_count):
+        headers = {"If-None-Match": etag} if conditional and etag else {}
+        start = time.perf_counter()
+        connection.request("GET", target, headers=headers)
+        response = connection.getresponse()
+        body = response.read()
+        latencies.append(time.perf_counter() - start)
+        statuses[response.status] = statuses.get(response.status, 0) + 1
+        received += len(body)
+        etag = response.getheader("ETag", etag)
+    connection.close()
+    with lock:
+        for status, count in statuses.items():
+            results["statuses"][status] = results["statuses"].get(status, 0) + count
+        results["latencies"].extend(latencies)
+        results["bytes"] += received
+
+
+# Main execution
+if __name__ == "__main__":
+
+    # python run_cli.py serve --quiet
+    # python run_load_test.py "http://127.0.0.1:8000/values?pair=XYZ/FKE" --conditional
+    parser = argparse.ArgumentParser(description="Load test of the query service")
+    parser.add_argument("url")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="per worker")
+    parser.add_argument(
+        "--conditional",
+        action="store_true",
+        help="send If-None-Match with the last ETag (measures the 304 path)",
+    )
+    args = parser.parse_args()
+
+    results = {"statuses": {}, "latencies": [], "bytes": 0}
+    lock = threading.Lock()
+    workers = [
+        threading.Thread(
+            target=run_worker,
+            args=(args.url, args.requests, args.conditional, results, lock),
+        )
+        for _ in range(args.concurrency)
+    ]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(results["latencies"]) * 1000
+    total = len(latencies_ms)
+    print(f"requests:     {total} ({args.concurrency} workers)")
+    print(f"statuses:     {dict(sorted(results['statuses'].items()))}")
+    print(f"elapsed:      {elapsed:.3f} s")
+    print(f"requests/sec: {total / elapsed:,.1f}")
+    print(f"MB/sec:       {results['bytes'] / elapsed / 1e6:,.2f}")
+    print(
+        "latency ms:   p50 {:.2f}  p95 {:.2f}  p99 {:.2f}".format(
+            *np.percentile(latencies_ms, [50, 95, 99])
+        )
+    )
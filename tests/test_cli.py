@@ -0,0 +1,115 @@
+# tests/test_cli.py
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+import pandas as pd
+from rate_prophet.cli import main
+from rate_prophet.model_db import SQLiteModel
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.directory.name, "cli.db")
+        self.csv_files = []
+        for index, name in enumerate(["AAA", "BBB"]):
+            path = os.path.join(self.directory.name, f"{name}.csv")
+            pd.DataFrame(
+                {
+                    "timestamp": pd.date_range("2022-01-01", periods=24, freq="h"),
+                    "value": [float(index)] * 24,
+                }
+            ).to_csv(path, index=False)
+            self.csv_files.append(path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_cli(self, *argv) -> tuple[int, str]:
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            exit_code = main(["--db", self.db, *argv])
+        return exit_code, output.getvalue()
+
+    def test_import_and_export(self):
+        """Test importing CSV files in parallel and exporting a range back."""
+        exit_code, _ = self.run_cli(
+            "import", "--jobs", "2", f"AAA/XYZ={self.csv_files[0]}", self.csv_files[1]
+        )
+        self.assertEqual(exit_code, 0)
+
+        model = SQLiteModel(db_name=self.db)
+        try:
+            self.assertEqual(sorted(model.get_pairs()["name"]), ["AAA/XYZ", "BBB"])
+        finally:
+            model.conn.close()
+
+        exit_code, output = self.run_cli(
+            "export", "BBB", "--start", "2022-01-01T10:00", "--end", "2022-01-01T12:00"
+        )
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(
+            output.splitlines(),
+            [
+                "timestamp,value",
+                "2022-01-01 10:00:00,1.0",
+                "2022-01-01 11:00:00,1.0",
+                "2022-01-01 12:00:00,1.0",
+            ],
+        )
+
+    def test_pair_maintenance(self):
+        """Test adding, updating and deleting a pair."""
+        self.assertEqual(self.run_cli("pairs", "add", "CCC/DDD")[0], 0)
+        self.assertEqual(
+            self.run_cli("pairs", "update", "CCC/DDD", "--description", "New")[0], 0
+        )
+        self.assertIn("New", self.run_cli("pairs", "list")[1])
+        self.assertEqual(self.run_cli("pairs", "delete", "CCC/DDD")[0], 0)
+        self.assertEqual(self.run_cli("export", "CCC/DDD")[0], 1)
+
+        output_path = os.path.join(self.directory.name, "out.csv")
+        with open(output_path, "w") as file:
+            file.write("keep")
+        with contextlib.redirect_stderr(io.StringIO()):
+            exit_code, _ = self.run_cli("export", "NOPE", "--output", output_path)
+        self.assertEqual(exit_code, 1)
+        with open(output_path) as file:
+            self.assertEqual(file.read(), "keep")
+
+    def test_missing_pair_and_files_fail(self):
+        """Test non-zero exit codes for missing pairs and unreadable sources."""
+        self.assertEqual(self.run_cli("pairs", "delete", "NOP/EXI")[0], 1)
+        self.assertEqual(
+            self.run_cli("pairs", "update", "NOP/EXI", "--description", "x")[0], 1
+        )
+
+        missing_csv = os.path.join(self.directory.name, "missing.csv")
+        errors = io.StringIO()
+        with contextlib.redirect_stderr(errors):
+            exit_code, output = self.run_cli(
+                "import", f"MIS/SNG={missing_csv}", self.csv_files[0]
+            )
+            self.assertEqual(
+                self.run_cli("snapshot", "import", missing_csv)[0], 1
+            )
+        self.assertEqual(exit_code, 1)
+        self.assertIn(f"MIS/SNG: cannot read {missing_csv}", errors.getvalue())
+        self.assertIn("AAA: 24 rows added", output)
+
+    def test_failed_import_removes_created_pair(self):
+        """Test that a CSV with duplicate timestamps does not leave an empty pair."""
+        path = os.path.join(self.directory.name, "DUP.csv")
+        pd.DataFrame(
+            {
+                "timestamp": ["2022-01-01 00:00:00", "2022-01-01 00:00:00"],
+                "value": [1.0, 2.0],
+            }
+        ).to_csv(path, index=False)
+        with contextlib.redirect_stderr(io.StringIO()):
+            exit_code, output = self.run_cli("import", path)
+        self.assertEqual(exit_code, 1)
+        self.assertIn("DUP: 0 rows added", output)
+        self.assertNotIn("DUP", self.run_cli("pairs", "list")[1])
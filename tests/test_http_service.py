@@ -0,0 +1,181 @@
+# tests/test_http_service.py
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+from email.utils import format_datetime
+import numpy as np
+import pandas as pd
+from rate_prophet.http_service import QueryServer
+from rate_prophet.model_db import SQLiteModel
+
+
+class TestQueryService(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.directory.name, "service.db")
+        self.model = SQLiteModel(db_name=self.db)
+        self.timeseries = pd.Series(
+            np.arange(48, dtype=float),
+            index=pd.date_range("2022-01-01", periods=48, freq="h"),
+        )
+        self.model.add_pair("ABC/DEF", "Service pair")
+        self.model.add_values("ABC/DEF", self.timeseries)
+
+        self.server = QueryServer(("127.0.0.1", 0), self.db, pool_size=2, quiet=True)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.thread.join()
+        self.server.server_close()
+        self.model.conn.close()
+        self.directory.cleanup()
+
+    def get(self, path: str, headers: dict = None):
+        request = urllib.request.Request(self.base_url + path, headers=headers or {})
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, response.headers, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.headers, e.read()
+
+    def test_values_json_and_binary(self):
+        """Test serving a range as JSON and as raw little-endian arrays."""
+        status, _, body = self.get(
+            "/values?pair=ABC/DEF&start=2022-01-01T10:00&end=2022-01-01T12:00"
+        )
+        self.assertEqual(status, 200)
+        data = json.loads(body)
+        self.assertEqual(data["values"], [10.0, 11.0, 12.0])
+        self.assertEqual(data["timestamps"][0], "2022-01-01 10:00:00")
+
+        status, headers, body = self.get("/values?pair=ABC/DEF&format=binary")
+        rows = int(headers["X-Row-Count"])
+        self.assertEqual(rows, 48)
+        timestamps = np.frombuffer(body[: rows * 8], dtype="<i8")
+        values = np.frombuffer(body[rows * 8 :], dtype="<f8")
+        np.testing.assert_array_equal(values, self.timeseries.values)
+        np.testing.assert_array_equal(
+            timestamps.astype("datetime64[s]"),
+            self.timeseries.index.values.astype("datetime64[s]"),
+        )
+
+    def test_empty_range(self):
+        """Test that a range without values returns empty arrays."""
+        self.model.add_pair("NOV/ALS", "Pair without values")
+        for query in ("pair=ABC/DEF&end=2021-01-01", "pair=NOV/ALS"):
+            status, _, body = self.get(f"/values?{query}")
+            self.assertEqual(status, 200, query)
+            self.assertEqual(json.loads(body)["timestamps"], [])
+            self.assertEqual(json.loads(body)["values"], [])
+        status, headers, body = self.get("/values?pair=NOV/ALS&format=binary")
+        self.assertEqual((status, headers["X-Row-Count"], body), (200, "0", b""))
+
+    def test_downsampling(self):
+        """Test resampling to a coarser grid and limiting the number of points."""
+        _, _, body = self.get("/values?pair=ABC/DEF&freq=D&aggregation=max")
+        self.assertEqual(json.loads(body)["values"], [23.0, 47.0])
+        _, _, body = self.get("/values?pair=ABC/DEF&max_points=4")
+        self.assertEqual(json.loads(body)["values"], [5.5, 17.5, 29.5, 41.5])
+
+    def test_conditional_requests(self):
+        """Test 304 responses until the pair data version changes."""
+        # Values were just added, Last-Modified is only sent for older changes
+        self.model.cursor.execute(
+            "UPDATE PairVersions SET modified = '2022-01-01 00:00:00.500000'"
+        )
+        self.model.conn.commit()
+        status, headers, _ = self.get("/values?pair=ABC/DEF")
+        etag, last_modified = headers["ETag"], headers["Last-Modified"]
+        self.assertEqual(status, 200)
+        self.assertIsNotNone(last_modified)
+
+        status, _, body = self.get("/values?pair=ABC/DEF", {"If-None-Match": etag})
+        self.assertEqual((status, body), (304, b""))
+        status, _, _ = self.get(
+            "/values?pair=ABC/DEF", {"If-Modified-Since": last_modified}
+        )
+        self.assertEqual(status, 304)
+
+        self.model.add_values(
+            "ABC/DEF", pd.Series([100.0], index=[pd.Timestamp("2022-01-03")])
+        )
+        status, headers, _ = self.get("/values?pair=ABC/DEF", {"If-None-Match": etag})
+        self.assertEqual(status, 200)
+        self.assertNotEqual(headers["ETag"], etag)
+        status, _, _ = self.get(
+            "/values?pair=ABC/DEF", {"If-Modified-Since": last_modified}
+        )
+        self.assertEqual(status, 200)
+
+    def test_etag_differs_between_representations(self):
+        """Test that an ETag of one format or range does not validate another."""
+        _, headers, _ = self.get("/values?pair=ABC/DEF")
+        etag = headers["ETag"]
+        self.assertEqual(
+            self.get("/values?pair=ABC/DEF", {"If-None-Match": etag})[0], 304
+        )
+        for query in (
+            "format=binary",
+            "start=2022-01-02T00:00",
+            "max_points=4",
+            "freq=D&aggregation=max",
+        ):
+            status, headers, _ = self.get(
+                f"/values?pair=ABC/DEF&{query}", {"If-None-Match": etag}
+            )
+            self.assertEqual(status, 200, query)
+            self.assertNotEqual(headers["ETag"], etag)
+
+    def test_recreated_pair_gets_new_etag(self):
+        """Test that a deleted and re-created pair (reusing its pair_id) is refetched."""
+        _, headers, _ = self.get("/values?pair=ABC/DEF")
+        etag = headers["ETag"]
+
+        self.model.delete_values("ABC/DEF", datetime(1970, 1, 1), datetime(2100, 1, 1))
+        self.model.delete_pair("ABC/DEF")
+        self.model.add_pair("ABC/DEF", "Re-created pair")
+        self.model.add_values(
+            "ABC/DEF", pd.Series([-1.0], index=[pd.Timestamp("2023-01-01")])
+        )
+
+        status, headers, body = self.get("/values?pair=ABC/DEF", {"If-None-Match": etag})
+        self.assertEqual(status, 200)
+        self.assertNotEqual(headers["ETag"], etag)
+        self.assertEqual(json.loads(body)["values"], [-1.0])
+
+    def test_writes_within_one_second(self):
+        """Test that If-Modified-Since does not hide a second write in the same second."""
+        # Start right after a second boundary, the steps below take far less than a second
+        time.sleep(1.01 - time.time() % 1)
+        self.model.add_values(
+            "ABC/DEF", pd.Series([50.0], index=[pd.Timestamp("2022-01-05")])
+        )
+        _, headers, _ = self.get("/values?pair=ABC/DEF")
+        self.assertNotIn("Last-Modified", headers)
+
+        self.model.add_values(
+            "ABC/DEF", pd.Series([51.0], index=[pd.Timestamp("2022-01-06")])
+        )
+        this_second = datetime.now(timezone.utc).replace(microsecond=0)
+        status, _, body = self.get(
+            "/values?pair=ABC/DEF",
+            {"If-Modified-Since": format_datetime(this_second, usegmt=True)},
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)["values"][-1], 51.0)
+
+    def test_errors(self):
+        """Test unknown pairs and invalid parameters."""
+        self.assertEqual(self.get("/values?pair=XXX/YYY")[0], 404)
+        self.assertEqual(self.get("/values?pair=ABC/DEF&format=xml")[0], 400)
+        self.assertEqual(self.get("/values")[0], 400)
+        self.assertEqual(self.get("/unknown")[0], 404)
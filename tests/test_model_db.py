@@ -1,7 +1,12 @@
 # tests/test_sqlite_model.py
 import unittest
+from rate_prophet import model_db
 from rate_prophet.model_db import SQLiteModel
+from rate_prophet.util_snapshot import load_snapshot_pair, pair_file_names
 import os
+import tempfile
+from unittest import mock
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 
@@ -84,3 +89,164 @@ class TestSQLiteModel(unittest.TestCase):
         self.assertEqual(
             len(remaining_values), 1, "Incorrect remaining values after deletion"
         )
+
+    def test_export_import_snapshot(self):
+        """Test exporting a pair to a snapshot and importing it into another database."""
+        timeseries = pd.Series(
+            [1.5, 1.6, 1.7, 1.8],
+            index=pd.date_range(start="2022-02-01", periods=4, freq="h"),
+        )
+        self.model.add_pair("SNAP/EXP", "Snapshot pair")
+        self.model.add_values("SNAP/EXP", timeseries)
+
+        with tempfile.TemporaryDirectory() as directory:
+            exported_rows = self.model.export_snapshot(directory, ["SNAP/EXP"])
+            self.assertEqual(exported_rows, 4)
+
+            timestamps, values = load_snapshot_pair(directory, "SNAP/EXP")
+            self.assertIsInstance(values, np.memmap)
+            np.testing.assert_array_equal(values, timeseries.values)
+            np.testing.assert_array_equal(
+                timestamps, timeseries.index.values.astype("datetime64[s]")
+            )
+
+            imported_db = os.path.join(directory, "imported.db")
+            imported_model = SQLiteModel(db_name=imported_db)
+            try:
+                self.assertEqual(imported_model.import_snapshot(directory), 4)
+                imported = imported_model.get_values(
+                    "SNAP/EXP", datetime(2022, 2, 1), datetime(2022, 2, 2)
+                )
+            finally:
+                imported_model.conn.close()
+        pd.testing.assert_series_equal(imported, timeseries, check_freq=False)
+
+    def test_import_snapshot_failure(self):
+        """Test that a failed snapshot import raises and removes the pair it created."""
+        timeseries = pd.Series(
+            [4.1, 4.2],
+            index=pd.date_range(start="2022-06-01", periods=2, freq="h"),
+        )
+        self.model.add_pair("SNAP/DUP", "Snapshot duplicate pair")
+        self.model.add_values("SNAP/DUP", timeseries)
+
+        with tempfile.TemporaryDirectory() as directory:
+            self.model.export_snapshot(directory, ["SNAP/DUP"])
+            # Same rows again clash with the UNIQUE constraint
+            with self.assertRaises(ValueError):
+                self.model.import_snapshot(directory)
+
+            # A pair created by a failed import is removed again
+            timestamps = np.load(
+                os.path.join(directory, pair_file_names(0)[0]), mmap_mode="r+"
+            )
+            timestamps[1] = timestamps[0]
+            timestamps.flush()
+            del timestamps
+            imported_model = SQLiteModel(db_name=os.path.join(directory, "dup.db"))
+            try:
+                with self.assertRaises(ValueError):
+                    imported_model.import_snapshot(directory)
+                pairs = set(imported_model.get_pairs()["name"])
+            finally:
+                imported_model.conn.close()
+        self.assertNotIn("SNAP/DUP", pairs)
+
+    def test_iter_values(self):
+        """Test reading values in chunks."""
+        timeseries = pd.Series(
+            [2.1, 2.2, 2.3, 2.4, 2.5],
+            index=pd.date_range(start="2022-03-01", periods=5, freq="h"),
+        )
+        self.model.add_pair("ITER/VAL", "Chunked read pair")
+        self.model.add_values("ITER/VAL", timeseries)
+
+        chunks = list(
+            self.model.iter_values(
+                "ITER/VAL", datetime(2022, 3, 1), datetime(2022, 3, 2), chunk_size=2
+            )
+        )
+        self.assertEqual([len(values) for _, values in chunks], [2, 2, 1])
+        np.testing.assert_array_equal(
+            np.concatenate([values for _, values in chunks]), timeseries.values
+        )
+        np.testing.assert_array_equal(
+            np.concatenate([timestamps for timestamps, _ in chunks]),
+            timeseries.index.values.astype("datetime64[s]"),
+        )
+
+    def test_get_values_after_and_latest(self):
+        """Test incremental reads of values newer than a timestamp and of the newest values."""
+        timeseries = pd.Series(
+            [3.1, 3.2, 3.3, 3.4],
+            index=pd.date_range(start="2022-04-01", periods=4, freq="h"),
+        )
+        self.model.add_pair("LIVE/NEW", "Incremental read pair")
+        self.model.add_values("LIVE/NEW", timeseries)
+
+        newer = self.model.get_values_after("LIVE/NEW", datetime(2022, 4, 1, 1))
+        self.assertEqual(newer.tolist(), [3.3, 3.4])
+        self.assertEqual(
+            len(self.model.get_values_after("LIVE/NEW", datetime(2022, 4, 1, 3))), 0
+        )
+
+        latest = self.model.get_latest_values("LIVE/NEW", 3)
+        self.assertEqual(latest.tolist(), [3.2, 3.3, 3.4])
+        self.assertTrue(latest.index.is_monotonic_increasing)
+
+    def test_get_data_version(self):
+        """Test that changing values of a pair bumps its data version."""
+        self.model.add_pair("VERS/ION", "Versioned pair")
+        pair_id, version, modified = self.model.get_data_version("VERS/ION")
+        self.assertEqual((version, modified), (0, None))
+
+        self.model.add_values(
+            "VERS/ION", pd.Series([1.0], index=[pd.Timestamp("2022-05-01")])
+        )
+        self.assertEqual(self.model.get_data_version("VERS/ION")[:2], (pair_id, 1))
+        self.model.delete_values(
+            "VERS/ION", datetime(2022, 5, 1), datetime(2022, 5, 2)
+        )
+        _, version, modified = self.model.get_data_version("VERS/ION")
+        self.assertEqual(version, 2)
+        self.assertIsNotNone(modified)
+        # Only the deletion started a new generation
+        self.assertEqual(self.model.get_data_generation("VERS/ION"), (pair_id, 1, 2))
+
+    def test_export_snapshot_ignores_concurrent_writes(self):
+        """Test that a write during an export does not change the exported pair."""
+        with tempfile.TemporaryDirectory() as directory:
+            db = os.path.join(directory, "concurrent.db")
+            model = SQLiteModel(db_name=db)
+            model.cursor.execute("PRAGMA journal_mode=WAL").fetchone()
+            writer = SQLiteModel(db_name=db)
+            model.add_pair("CON/CUR", "Concurrently written pair")
+            model.add_values(
+                "CON/CUR",
+                pd.Series(
+                    [5.1, 5.2], index=pd.date_range("2022-07-01", periods=2, freq="h")
+                ),
+            )
+
+            open_snapshot_arrays = model_db.open_snapshot_arrays
+
+            def open_arrays_and_write(*args):
+                # Runs between counting and reading the rows
+                writer.add_values(
+                    "CON/CUR", pd.Series([5.3], index=[pd.Timestamp("2022-07-02")])
+                )
+                return open_snapshot_arrays(*args)
+
+            snapshot = os.path.join(directory, "snapshot")
+            try:
+                with mock.patch.object(
+                    model_db, "open_snapshot_arrays", open_arrays_and_write
+                ):
+                    exported_rows = model.export_snapshot(snapshot)
+                _, values = load_snapshot_pair(snapshot, "CON/CUR")
+                self.assertEqual(exported_rows, 2)
+                self.assertEqual(values.tolist(), [5.1, 5.2])
+                del values
+            finally:
+                writer.conn.close()
+                model.conn.close()
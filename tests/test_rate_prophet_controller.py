@@ -0,0 +1,63 @@
+# tests/test_rate_prophet_controller.py
+import os
+import tempfile
+import unittest
+import pandas as pd
+from rate_prophet.model_db import SQLiteModel
+from rate_prophet.rate_prophet_controller import RateProphetController
+
+
+class TestLiveBuffer(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.model = SQLiteModel(db_name=os.path.join(self.directory.name, "live.db"))
+        self.model.add_pair("LIV/BUF", "Live pair")
+        self.model.add_values("LIV/BUF", self.hourly("2022-01-01", [1.0, 2.0, 3.0]))
+        self.controller = RateProphetController(model=self.model)
+
+    def tearDown(self):
+        self.model.conn.close()
+        self.directory.cleanup()
+
+    @staticmethod
+    def hourly(start: str, values: list[float]) -> pd.Series:
+        return pd.Series(
+            values, index=pd.date_range(start, periods=len(values), freq="h")
+        )
+
+    def test_appends_only_new_values(self):
+        """Test that refreshes append values newer than the last seen one."""
+        buffer = self.controller.refresh_live_buffer("LIV/BUF")
+        self.assertEqual(buffer.to_series().tolist(), [1.0, 2.0, 3.0])
+
+        self.model.add_values("LIV/BUF", self.hourly("2022-01-01 03:00", [4.0]))
+        refreshed = self.controller.refresh_live_buffer("LIV/BUF")
+        self.assertIs(refreshed, buffer)
+        self.assertEqual(buffer.to_series().tolist(), [1.0, 2.0, 3.0, 4.0])
+
+    def test_resets_after_pair_is_recreated(self):
+        """Test that a deleted and re-imported pair does not mix with stale values."""
+        self.controller.refresh_live_buffer("LIV/BUF")
+
+        self.controller.delete_selected_pair("LIV/BUF")
+        self.model.add_pair("LIV/BUF", "Re-imported pair")
+        self.model.add_values("LIV/BUF", self.hourly("2021-06-01", [7.0, 8.0]))
+
+        buffer = self.controller.refresh_live_buffer("LIV/BUF")
+        self.assertEqual(buffer.to_series().tolist(), [7.0, 8.0])
+
+    def test_resets_after_backfill(self):
+        """Test that values inserted before the newest seen one are shown."""
+        self.controller.refresh_live_buffer("LIV/BUF")
+
+        self.model.add_values("LIV/BUF", self.hourly("2021-12-31 22:00", [0.1, 0.2]))
+        buffer = self.controller.refresh_live_buffer("LIV/BUF")
+        self.assertEqual(buffer.to_series().tolist(), [0.1, 0.2, 1.0, 2.0, 3.0])
+
+        self.model.add_values_bulk(
+            "LIV/BUF",
+            self.hourly("2021-12-31 20:00", [0.0]).index.values,
+            [-0.1],
+        )
+        buffer = self.controller.refresh_live_buffer("LIV/BUF")
+        self.assertEqual(buffer.to_series().iloc[0], -0.1)
@@ -0,0 +1,112 @@
+# tests/test_util_timeseries.py
+import unittest
+import numpy as np
+import pandas as pd
+from rate_prophet.util_timeseries import (
+    RegularGridResampler,
+    TimeseriesRingBuffer,
+    find_gaps,
+    resample_to_grid,
+)
+
+
+class TestRegularGridResampler(unittest.TestCase):
+    def setUp(self):
+        # Duplicate burst in the first hour, gaps at 02:00-03:00 and 05:00
+        self.values = pd.Series(
+            [1.0, 3.0, 5.0, 7.0, 9.0, 11.0],
+            index=pd.to_datetime(
+                [
+                    "2022-01-01 00:10:00",
+                    "2022-01-01 00:50:00",
+                    "2022-01-01 01:00:00",
+                    "2022-01-01 04:30:00",
+                    "2022-01-01 04:40:00",
+                    "2022-01-01 06:00:00",
+                ]
+            ),
+        )
+
+    def test_find_gaps(self):
+        """Test that gaps are reported with start, end and missing count."""
+        gaps = find_gaps(self.values, "h")
+        self.assertEqual(gaps["missing"].tolist(), [2, 1])
+        self.assertEqual(gaps["start"].iloc[0], pd.Timestamp("2022-01-01 02:00:00"))
+        self.assertEqual(gaps["end"].iloc[0], pd.Timestamp("2022-01-01 03:00:00"))
+        self.assertEqual(gaps["start"].iloc[1], pd.Timestamp("2022-01-01 05:00:00"))
+
+    def test_resample_aggregates_and_fills(self):
+        """Test aggregation of duplicates and filling of missing grid points."""
+        resampled, _ = resample_to_grid(self.values, "h", "mean", "ffill")
+        self.assertEqual(
+            resampled.tolist(), [2.0, 5.0, 5.0, 5.0, 8.0, 8.0, 11.0]
+        )
+        resampled, _ = resample_to_grid(self.values, "h", "last", "interpolate")
+        np.testing.assert_allclose(
+            resampled.values, [3.0, 5.0, 19 / 3, 23 / 3, 9.0, 10.0, 11.0]
+        )
+        resampled, _ = resample_to_grid(self.values, "h", "first", None)
+        self.assertEqual(resampled.isna().sum(), 3)
+
+    def test_streaming_matches_single_pass(self):
+        """Test that pushing rows in small chunks gives the same grid and gaps."""
+        expected, expected_gaps = resample_to_grid(self.values, "h", "mean", "ffill")
+        resampler = RegularGridResampler("h", "mean", "ffill")
+        timestamps, values = self.values.index.values, self.values.values
+        parts = [
+            resampler.push(timestamps[start : start + 2], values[start : start + 2])
+            for start in range(0, len(values), 2)
+        ]
+        parts.append(resampler.finish())
+        streamed = pd.concat(parts)
+        np.testing.assert_array_equal(streamed.index, expected.index)
+        np.testing.assert_array_equal(streamed.values, expected.values)
+        pd.testing.assert_frame_equal(resampler.get_gaps(), expected_gaps)
+
+    def test_rejects_non_positive_frequency(self):
+        """Test that zero and negative frequencies are rejected."""
+        for freq in ("0h", "-1h"):
+            with self.assertRaises(ValueError):
+                resample_to_grid(self.values, freq)
+
+    def test_rejects_rows_older_than_emitted_grid(self):
+        """Test that rows falling into already emitted cells are rejected."""
+        resampler = RegularGridResampler("h", "mean", "ffill")
+        resampler.push(self.values.index.values, self.values.values)
+        resampler.finish()
+        with self.assertRaises(ValueError):
+            resampler.push(self.values.index.values[:1], self.values.values[:1])
+
+
+class TestTimeseriesRingBuffer(unittest.TestCase):
+    def test_append_wraps_around(self):
+        """Test that the buffer keeps only the newest values in order."""
+        values = pd.Series(
+            np.arange(7, dtype=float),
+            index=pd.date_range("2022-01-01", periods=7, freq="h"),
+        )
+        buffer = TimeseriesRingBuffer(capacity=4)
+        self.assertIsNone(buffer.last_timestamp)
+
+        buffer.append(values.iloc[:3])
+        buffer.append(values.iloc[3:5])
+        self.assertEqual(buffer.to_series().tolist(), [1.0, 2.0, 3.0, 4.0])
+
+        buffer.append(values.iloc[5:])
+        pd.testing.assert_series_equal(
+            buffer.to_series(name="X"),
+            values.iloc[3:].rename("X"),
+            check_freq=False,
+            check_index_type=False,
+        )
+        self.assertEqual(buffer.last_timestamp, values.index[-1])
+
+        # More values than capacity in one append
+        buffer.append(
+            pd.Series(
+                np.arange(10.0, 20.0),
+                index=pd.date_range("2022-02-01", periods=10, freq="h"),
+            )
+        )
+        self.assertEqual(len(buffer), 4)
+        self.assertEqual(buffer.to_series().tolist(), [16.0, 17.0, 18.0, 19.0])